@@ -1,10 +1,70 @@
+import hashlib
+import mmap
 import os
-import yaml
-from typing import List, Set, Optional, Dict, Any, Tuple
-from collections import defaultdict
+import pickle
+import sys
+import threading
+from typing import List, Set, FrozenSet, Optional, Dict, Any, Tuple
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from .changelog import ChangeLog, ChangeLogDependency
 import logging # Added logging import
 
+# PyYAML is imported lazily on the first actual parse: importing it (and the
+# libyaml extension) at module import time penalizes code paths that never
+# touch a YAML file, such as --help invocations or cache-served runs. The
+# resolved loader class is memoized so the fallback check runs once. The
+# libyaml C loader is preferred when PyYAML was built against it; it parses
+# the same (safe) subset of YAML several times faster than the pure-Python
+# loader.
+_YAML_LOADER = None
+# Placeholder until PyYAML is imported; an empty tuple in an except clause
+# matches nothing, so pre-import exceptions propagate unchanged.
+_YAML_ERROR: Any = ()
+
+
+def _get_yaml_loader():
+    """
+    Imports PyYAML on first use and returns the fastest safe loader class.
+    """
+    global _YAML_LOADER, _YAML_ERROR
+    if _YAML_LOADER is None:
+        import yaml
+        _YAML_ERROR = yaml.YAMLError
+        try:
+            from yaml import CSafeLoader as _loader
+        except ImportError:
+            from yaml import SafeLoader as _loader
+        _YAML_LOADER = _loader
+    return _YAML_LOADER
+
+# Optional rapidyaml engine. When the `rapidyaml` package is installed, changelog
+# files are parsed in place by the native parser and only the keys this module
+# actually consumes are projected into Python objects, which avoids materializing
+# a full dict/list tree per file. Set CHANGELOG_YAML_ENGINE=pyyaml to force the
+# PyYAML loader even when rapidyaml is available.
+_RYML = None
+if os.environ.get("CHANGELOG_YAML_ENGINE", "ryml") != "pyyaml":
+    try:
+        import ryml as _RYML
+    except ImportError:
+        _RYML = None
+
+# Caps how many changelog files may be held open at once. The prefetch pool
+# already bounds worker count, but a generous include tree plus caller threads
+# could still approach the process fd limit (1024 soft on typical CI Linux);
+# a semaphore keeps the ceiling explicit. Override via LIQUIBASE_CH_MAX_OPEN_FILES.
+_FILE_SEMAPHORE = threading.BoundedSemaphore(
+    int(os.environ.get("LIQUIBASE_CH_MAX_OPEN_FILES", "32"))
+)
+
+# Opt-in persistent parse cache. When LIQUIBASE_CH_PARSE_CACHE=1, the fully
+# parsed change list is pickled under ~/.cache/liquibase-clickhouse/ together
+# with a manifest of every YAML file touched; a later run reuses it only if
+# every manifest entry still has the same mtime and size.
+_PARSE_CACHE_ENV = "LIQUIBASE_CH_PARSE_CACHE"
+_PARSE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "liquibase-clickhouse")
+
 # Get a logger instance for this module.
 # Basic configuration is typically done once at the application's entry point (e.g., cli.py).
 logger = logging.getLogger(__name__)
@@ -19,6 +79,9 @@ class ChangelogParser:
     This class is responsible for understanding the structure of the changelog
     files and building a coherent list of changes to be applied.
     """
+    # Upper bound on memoized parsed YAML dicts before LRU eviction kicks in.
+    _YAML_CACHE_MAX = 128
+
     def __init__(self, master_changelog_path: str, state_manager: Optional[Any] = None):
         """
         Initializes the ChangelogParser.
@@ -38,14 +101,142 @@ class ChangelogParser:
 
         self.master_changelog_path = os.path.abspath(master_changelog_path)
         self.state_manager = state_manager
+        # Memoizes parsed YAML content keyed on (path, mtime_ns, size) so a file
+        # is only read and parsed once per process unless it changes on disk.
+        # Bounded LRU: the least recently used entry is evicted past
+        # _YAML_CACHE_MAX so huge trees cannot pin every parsed dict in memory.
+        self._yaml_cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+        # Caches directory listings so existence checks for referenced files
+        # cost one scandir per directory instead of one stat per entry.
+        self._dir_listing_cache: Dict[str, Set[str]] = {}
+        # Filled alongside the flat change list during parsing; maps each
+        # changelog's relative path to its changes in definition order.
+        self._changes_by_file: Optional[Dict[str, List[ChangeLog]]] = None
+        # Memoized result of get_all_changes; a second call within one process
+        # returns the same list instead of re-walking the changelog tree.
+        self._all_changes_cache: Optional[List[ChangeLog]] = None
+        # Memoized applied-changes set; repeated get_unapplied_changes calls
+        # (dry-run followed by apply) hit ClickHouse only once. Cleared by
+        # invalidate().
+        self._applied_cache: Optional[FrozenSet[Tuple[str, str]]] = None
+        # Every (path, mtime_ns, size) seen by _load_yaml in the current parse;
+        # forms the dependency manifest for the persistent parse cache.
+        self._touched: Set[Tuple[str, int, int]] = set()
         # The project_root is derived from the master changelog's directory.
         # All relative paths in changelog dependencies are resolved against this root.
         self.project_root = os.path.dirname(self.master_changelog_path)
+        # Precomputed prefix for _rel(): paths under the project root are
+        # relativized by slicing instead of os.path.relpath, which re-walks
+        # and normalizes both paths (including an abspath call) on every use.
+        self._root_prefix = self.project_root + os.sep
+        # Memoizes _rel() results per absolute path; repeated visits return
+        # the same relative-path string object.
+        self._relpath_cache: Dict[str, str] = {}
+        # The applied-changes query never varies within a parser's lifetime,
+        # so build (and sanity-check the table identifier for) it once here
+        # instead of per call.
+        self._applied_sql: Optional[str] = None
+        if state_manager is not None:
+            table_name = state_manager.table_name
+            if not all(part.isidentifier() for part in table_name.split(".")):
+                logger.error(f"Invalid state table name: {table_name}")
+                raise ValueError(f"Invalid state table name: {table_name}")
+            # FINAL collapses superseded rows of the ReplacingMergeTree state
+            # table so only each change's latest status is considered.
+            self._applied_sql = (
+                f"SELECT changelog_path, change_id FROM {table_name} FINAL "
+                "WHERE status = 'success'"
+            )
         logger.debug(f"ChangelogParser initialized. Master changelog: {self.master_changelog_path}, Project root: {self.project_root}")
 
+    def _rel(self, path: str) -> str:
+        """
+        Returns `path` relative to the project root, memoized per absolute path.
+
+        Fast path: paths already under the root are relativized by slicing off
+        the root prefix. Anything else falls back to os.path.relpath. Either
+        way the result is cached, so files revisited across the walk, the
+        prefetch pass and repeated get_unapplied_changes calls resolve to the
+        same string object without re-slicing or re-normalizing.
+        """
+        rel = self._relpath_cache.get(path)
+        if rel is None:
+            if path.startswith(self._root_prefix):
+                rel = path[len(self._root_prefix):]
+            else:
+                rel = os.path.relpath(path, self.project_root)
+            self._relpath_cache[path] = rel
+        return rel
+
+    def _exists(self, path: str) -> bool:
+        """
+        Checks whether `path` exists, using the per-directory listing cache.
+
+        The first check in a directory pays one scandir; subsequent checks for
+        files in the same directory are set lookups. Falls back to reporting
+        False when the directory itself cannot be listed.
+        """
+        dir_, name = os.path.split(path)
+        names = self._dir_listing_cache.get(dir_)
+        if names is None:
+            try:
+                names = {entry.name for entry in os.scandir(dir_)}
+            except OSError:
+                names = set()
+            self._dir_listing_cache[dir_] = names
+        return name in names
+
+    @staticmethod
+    def _ryml_node_to_py(tree, node) -> Any:
+        """
+        Converts a rapidyaml tree node into plain Python dicts/lists/strings.
+
+        Changelog files only contain string scalars, so scalar values are
+        decoded as UTF-8 strings without resolving YAML tags.
+        """
+        if tree.is_map(node):
+            return {
+                bytes(tree.key(child)).decode("utf-8"): ChangelogParser._ryml_node_to_py(tree, child)
+                for child in _RYML.children(tree, node)
+            }
+        if tree.is_seq(node):
+            return [
+                ChangelogParser._ryml_node_to_py(tree, child)
+                for child in _RYML.children(tree, node)
+            ]
+        return bytes(tree.val(node)).decode("utf-8")
+
+    def _load_yaml_ryml(self, filepath: str) -> Dict[str, Any]:
+        """
+        Parses a changelog YAML file with rapidyaml, projecting only the
+        top-level 'changes' list into Python objects.
+
+        Args:
+            filepath (str): The absolute path to the YAML file to load.
+
+        Returns:
+            Dict[str, Any]: A dictionary holding the projected 'changes' list,
+                            or an empty dict if the file has none.
+        """
+        with _FILE_SEMAPHORE:
+            with open(filepath, "rb") as f:
+                buf = bytearray(f.read())
+        tree = _RYML.parse_in_place(buf)
+        root = tree.root_id()
+        if not tree.is_map(root):
+            return {}
+        for child in _RYML.children(tree, root):
+            if bytes(tree.key(child)) == b"changes":
+                return {"changes": self._ryml_node_to_py(tree, child)}
+        return {}
+
     def _load_yaml(self, filepath: str) -> Dict[str, Any]:
         """
-        Loads and parses a YAML file safely.
+        Loads and parses a YAML file safely, memoizing the parsed content.
+
+        The result is cached keyed on (path, mtime_ns, size), so repeated calls
+        within one process (e.g. get_all_changes followed by
+        get_unapplied_changes) parse each unchanged file only once.
 
         Args:
             filepath (str): The absolute path to the YAML file to load.
@@ -58,56 +249,156 @@ class ChangelogParser:
             ValueError: If there's an error parsing the YAML content.
         """
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                content = yaml.safe_load(f)
-                if not isinstance(content, dict):
-                    logger.warning(f"YAML file {filepath} content is not a dictionary. Returning empty dict.")
-                    return {}
-                logger.debug(f"Successfully loaded YAML file: {filepath}")
+            st = os.stat(filepath)
+        except FileNotFoundError:
+            logger.error(f"Changelog file not found: {filepath}")
+            raise
+        cache_key = (filepath, st.st_mtime_ns, st.st_size)
+        self._touched.add(cache_key)
+        cached = self._yaml_cache.get(cache_key)
+        if cached is not None:
+            self._yaml_cache.move_to_end(cache_key)
+            logger.debug("YAML cache hit for: %s", filepath)
+            return cached
+        content = self._parse_yaml_file(filepath)
+        self._yaml_cache[cache_key] = content
+        if len(self._yaml_cache) > self._YAML_CACHE_MAX:
+            self._yaml_cache.popitem(last=False)
+        return content
+
+    @staticmethod
+    def _load_single_document(stream) -> Any:
+        """
+        Parses one YAML document from `stream` by instantiating the resolved
+        loader class directly.
+
+        Equivalent to yaml.load(stream, Loader=_YAML_LOADER) minus the
+        dispatcher that re-constructs and introspects the loader on each call.
+        """
+        loader = _get_yaml_loader()(stream)
+        try:
+            return loader.get_single_data()
+        finally:
+            loader.dispose()
+
+    def _parse_yaml_file(self, filepath: str) -> Dict[str, Any]:
+        """
+        Parses a YAML file from disk without consulting the cache.
+
+        Args:
+            filepath (str): The absolute path to the YAML file to parse.
+
+        Returns:
+            Dict[str, Any]: The parsed content of the YAML file as a dictionary.
+
+        Raises:
+            FileNotFoundError: If the specified YAML file does not exist.
+            ValueError: If there's an error parsing the YAML content.
+        """
+        if _RYML is not None:
+            try:
+                content = self._load_yaml_ryml(filepath)
+                logger.debug("Successfully loaded YAML file via rapidyaml: %s", filepath)
                 return content
+            except FileNotFoundError:
+                logger.error(f"Changelog file not found: {filepath}")
+                raise
+            except Exception as e:
+                logger.warning(f"rapidyaml failed to parse {filepath}: {e}. Falling back to PyYAML.")
+        try:
+            try:
+                # Binary mmap lets libyaml scan the raw buffer directly,
+                # skipping Python's text decode and one full copy of the file.
+                with _FILE_SEMAPHORE:
+                    with open(filepath, "rb") as f:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            content = self._load_single_document(mm)
+            except (ValueError, OSError):
+                # Empty files cannot be mapped and some filesystems refuse
+                # mmap; fall back to a plain text-mode read.
+                with _FILE_SEMAPHORE:
+                    with open(filepath, "r", encoding="utf-8") as f:
+                        content = self._load_single_document(f)
+            if not isinstance(content, dict):
+                logger.warning(f"YAML file {filepath} content is not a dictionary. Returning empty dict.")
+                return {}
+            logger.debug("Successfully loaded YAML file: %s", filepath)
+            return content
         except FileNotFoundError:
             logger.error(f"Changelog file not found: {filepath}")
             raise
-        except yaml.YAMLError as e:
+        except _YAML_ERROR as e:
             logger.error(f"Error parsing YAML file {filepath}: {e}")
             raise ValueError(f"Error parsing YAML file {filepath}: {e}")
 
-    def _parse_file_recursively(self,
-                                filepath: str,
-                                all_parsed_changes: List[ChangeLog],
-                                processed_files: Set[str],
-                                current_changelog_rel_path: str):
+    def _parse_files_iteratively(self,
+                                 root_filepath: str,
+                                 all_parsed_changes: List[ChangeLog],
+                                 parsed_by_file: Dict[str, List[ChangeLog]],
+                                 processed_files: Set[Tuple[int, int]],
+                                 root_rel_path: str):
         """
-        Recursively parses a changelog YAML file and collects all defined changes,
-        including their index and dependencies. This method handles `sql` and `yaml`
-        change types and prevents circular includes.
+        Parses a changelog YAML file and collects all defined changes, including
+        their index and dependencies. `yaml` includes are expanded depth-first
+        at the point where they appear, using an explicit stack of per-file
+        entry iterators instead of Python recursion — deep include chains incur
+        no interpreter frame overhead and cannot hit RecursionError. Circular
+        includes are detected and skipped.
 
         Args:
-            filepath (str): The absolute path to the current changelog YAML file being parsed.
+            root_filepath (str): The absolute path to the changelog YAML file to start from.
             all_parsed_changes (List[ChangeLog]): A list to accumulate all ChangeLog objects found.
-            processed_files (Set[str]): A set of relative file paths of changelogs already processed
+            parsed_by_file (Dict[str, List[ChangeLog]]): A mapping filled in the same pass,
+                                                         grouping changes by their changelog's
+                                                         relative path in definition order.
+            processed_files (Set[Tuple[int, int]]): (st_dev, st_ino) identities of changelogs already processed
                                         in the current parsing chain to detect circular dependencies.
-            current_changelog_rel_path (str): The relative path of the current changelog file
-                                              from the project root, used for ChangeLog objects.
+            root_rel_path (str): The relative path of the root changelog file
+                                 from the project root, used for ChangeLog objects.
 
         Raises:
             ValueError: If a change entry has an invalid format, missing required fields,
                         or an unknown change type.
             FileNotFoundError: If a referenced SQL or included YAML file does not exist.
         """
-        rel_path_for_processed_files = os.path.relpath(filepath, self.project_root)
-
-        if rel_path_for_processed_files in processed_files:
-            logger.warning(f"Circular include detected: {rel_path_for_processed_files}. Skipping to prevent infinite loop.")
-            return
-        processed_files.add(rel_path_for_processed_files)
-        logger.debug(f"Parsing changelog file: {filepath} (Relative: {current_changelog_rel_path})")
-
-        data = self._load_yaml(filepath)
-        changes_list = data.get("changes", [])
-
-        for idx, entry in enumerate(changes_list):
+        # Each stack frame is (filepath, rel_path, iterator over enumerated entries).
+        # Each stack frame carries the file's directory so per-entry path joins
+        # do not recompute dirname.
+        stack: List[Tuple[str, str, str, Any]] = []
+
+        def _push_file(filepath: str, rel_path: str):
+            # Dedupe on (st_dev, st_ino) rather than path strings: integer
+            # tuples hash cheaply and two spellings of the same file (symlink,
+            # non-normalized relative path) collapse to one identity.
+            st = os.stat(filepath)
+            file_key = (st.st_dev, st.st_ino)
+            if file_key in processed_files:
+                logger.warning(f"Circular include detected: {self._rel(filepath)}. Skipping to prevent infinite loop.")
+                return
+            processed_files.add(file_key)
+            logger.debug("Parsing changelog file: %s (Relative: %s)", filepath, rel_path)
+            data = self._load_yaml(filepath)
+            # Interned once per file; every ChangeLog from this file then shares
+            # the same str object for its changelog_file.
+            stack.append((filepath, os.path.dirname(filepath), sys.intern(rel_path),
+                          iter(enumerate(data.get("changes", [])))))
+
+        # Guards against two changes resolving to the same (changelog, id)
+        # key, which would silently overwrite entries in change_lookup and
+        # corrupt the dependency sort.
+        seen_ids: Set[Tuple[str, str]] = set()
+
+        _push_file(root_filepath, root_rel_path)
+        while stack:
+            filepath, file_dir, current_changelog_rel_path, entries = stack[-1]
+            entry_item = next(entries, None)
+            if entry_item is None:
+                stack.pop()
+                continue
+            idx, entry = entry_item
             type_ = entry.get("type")
+            if isinstance(type_, str):
+                type_ = sys.intern(type_)
             description = entry.get("description", "")
             file_ref = entry.get("file")
             change_id_raw = entry.get("id")
@@ -121,12 +412,20 @@ class ChangelogParser:
                 raise ValueError(error_msg)
 
             for dep_entry in depends_on_raw:
-                if not isinstance(dep_entry, dict):
+                # Fast path assumes the common well-formed shape (a dict with
+                # both keys present); malformed entries fall through to the
+                # detailed validation errors below.
+                try:
+                    dep_changelog_path = dep_entry["changelog_path"]
+                    dep_change_id = dep_entry["change_id"]
+                except TypeError:
                     error_msg = f"Invalid dependency format in {filepath} for change ID '{change_id_raw}'. Expected a dictionary with 'changelog_path' and 'change_id'."
                     logger.error(error_msg)
                     raise ValueError(error_msg)
-                dep_changelog_path = dep_entry.get("changelog_path")
-                dep_change_id = dep_entry.get("change_id")
+                except KeyError:
+                    error_msg = f"Missing 'changelog_path' or 'change_id' in dependency for change ID '{change_id_raw}' in {filepath}. Dependency: {dep_entry}"
+                    logger.error(error_msg)
+                    raise ValueError(error_msg)
                 if not dep_changelog_path or not dep_change_id:
                     error_msg = f"Missing 'changelog_path' or 'change_id' in dependency for change ID '{change_id_raw}' in {filepath}. Dependency: {dep_entry}"
                     logger.error(error_msg)
@@ -140,18 +439,25 @@ class ChangelogParser:
                     logger.error(error_msg)
                     raise ValueError(error_msg)
 
-                full_sql_path = os.path.join(os.path.dirname(filepath), file_ref)
-                if not os.path.isfile(full_sql_path):
+                full_sql_path = os.path.join(file_dir, file_ref)
+                if not self._exists(full_sql_path):
                     error_msg = f"SQL file not found referenced by {filepath}: {full_sql_path} for change ID '{change_id_raw}'."
                     logger.error(error_msg)
                     raise FileNotFoundError(error_msg)
 
                 change_id = change_id_raw if change_id_raw else f"{os.path.basename(file_ref).split('.')[0]}_{idx}"
+                id_key = (current_changelog_rel_path, change_id)
+                if id_key in seen_ids:
+                    error_msg = f"Duplicate change id '{change_id}' in changelog '{current_changelog_rel_path}'. Change ids must be unique within a changelog file."
+                    logger.error(error_msg)
+                    raise ValueError(error_msg)
+                seen_ids.add(id_key)
                 change_obj = ChangeLog(change_id, type_, description, full_sql_path,
                                        parsed_dependencies,
                                        changelog_file=current_changelog_rel_path, index=idx)
                 all_parsed_changes.append(change_obj)
-                logger.debug(f"Added SQL change: ID='{change_obj.id}', File='{change_obj.file_path}', Dependencies={len(parsed_dependencies)}")
+                parsed_by_file.setdefault(current_changelog_rel_path, []).append(change_obj)
+                logger.debug("Added SQL change: ID=%r, File=%r, Dependencies=%d", change_obj.id, change_obj.file_path, len(parsed_dependencies))
 
             elif type_ == "yaml":
                 if not file_ref:
@@ -159,63 +465,275 @@ class ChangelogParser:
                     logger.error(error_msg)
                     raise ValueError(error_msg)
 
-                full_yaml_path = os.path.join(os.path.dirname(filepath), file_ref)
-                if not os.path.isfile(full_yaml_path):
+                full_yaml_path = os.path.join(file_dir, file_ref)
+                if not self._exists(full_yaml_path):
                     error_msg = f"Included changelog file not found referenced by {filepath}: {full_yaml_path}."
                     logger.error(error_msg)
                     raise FileNotFoundError(error_msg)
 
-                # Recursively parse the included YAML file
-                included_changelog_rel_path = os.path.relpath(full_yaml_path, self.project_root)
-                self._parse_file_recursively(full_yaml_path, all_parsed_changes, processed_files, included_changelog_rel_path)
-                logger.debug(f"Recursively parsed included YAML: {full_yaml_path}")
+                # Push the included YAML file; its entries are processed before
+                # the remaining entries of the current file, matching the old
+                # recursive expansion order.
+                included_changelog_rel_path = self._rel(full_yaml_path)
+                _push_file(full_yaml_path, included_changelog_rel_path)
+                logger.debug("Queued included YAML for parsing: %s", full_yaml_path)
 
             else:
                 error_msg = f"Unknown change type: '{type_}' in changelog: {filepath} for change ID '{change_id_raw}'."
                 logger.error(error_msg)
                 raise ValueError(error_msg)
 
+    def _prefetch_yaml_tree(self):
+        """
+        Concurrently parses every changelog YAML reachable from the master file
+        into the YAML cache.
+
+        Files are discovered breadth-first by reading only the `yaml` include
+        entries of already-parsed files and parsed by a thread pool — file
+        reads overlap and libyaml releases the GIL while tokenizing. Errors are
+        deliberately swallowed here; the serial walk afterwards re-raises them
+        with full context. The subsequent _parse_files_iteratively pass is then
+        served entirely from the cache.
+        """
+        max_workers = min(8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            seen: Set[str] = {self.master_changelog_path}
+            pending = {self.master_changelog_path: executor.submit(self._load_yaml, self.master_changelog_path)}
+            while pending:
+                next_pending = {}
+                for filepath, future in pending.items():
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        logger.debug("Prefetch of %s failed (%s); deferring to serial parse.", filepath, e)
+                        continue
+                    file_dir = os.path.dirname(filepath)
+                    for entry in data.get("changes", []):
+                        if not isinstance(entry, dict) or entry.get("type") != "yaml":
+                            continue
+                        file_ref = entry.get("file")
+                        if not file_ref:
+                            continue
+                        child_path = os.path.join(file_dir, file_ref)
+                        if child_path not in seen and os.path.isfile(child_path):
+                            seen.add(child_path)
+                            next_pending[child_path] = executor.submit(self._load_yaml, child_path)
+                pending = next_pending
+        logger.debug("Prefetched %d changelog file(s) into the YAML cache.", len(seen))
+
+    def _parse_cache_path(self) -> str:
+        """
+        Returns the persistent parse-cache file path for this master changelog.
+        """
+        digest = hashlib.blake2b(
+            self.master_changelog_path.encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return os.path.join(_PARSE_CACHE_DIR, f"{digest}.parse.pkl")
+
+    def _load_parse_cache(self) -> Optional[Tuple[List[ChangeLog], Dict[str, List[ChangeLog]]]]:
+        """
+        Loads a previously persisted parse result, validating its manifest.
+
+        The cached result is used only when every YAML file recorded during the
+        original parse still exists with the same mtime and size; any mismatch
+        (or any unpickling problem) simply falls back to a fresh parse.
+        """
+        try:
+            with open(self._parse_cache_path(), "rb") as f:
+                manifest, all_changes, changes_by_file = pickle.load(f)
+            for filepath, mtime_ns, size in manifest:
+                st = os.stat(filepath)
+                if st.st_mtime_ns != mtime_ns or st.st_size != size:
+                    return None
+        except (OSError, pickle.PickleError, EOFError, ValueError, AttributeError, IndexError):
+            return None
+        return all_changes, changes_by_file
+
+    def _store_parse_cache(self, all_changes: List[ChangeLog], changes_by_file: Dict[str, List[ChangeLog]]) -> None:
+        """
+        Persists the parse result with its file manifest. Cache writes are
+        best-effort: any filesystem error is ignored.
+        """
+        cache_path = self._parse_cache_path()
+        tmp_path = cache_path + f".tmp.{os.getpid()}"
+        try:
+            os.makedirs(_PARSE_CACHE_DIR, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump((sorted(self._touched), all_changes, changes_by_file), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            logger.debug("Could not write parse cache to %s", cache_path, exc_info=True)
+
     def get_all_changes(self) -> List[ChangeLog]:
         """
         Parses the master changelog and all recursively included changelogs
         to collect every defined database change without filtering.
 
+        When the LIQUIBASE_CH_PARSE_CACHE environment variable is set to "1",
+        the parse result is persisted to disk and reused on later runs as long
+        as no changelog file has changed (see _load_parse_cache).
+
         Returns:
             List[ChangeLog]: A list of all ChangeLog objects found across all changelog files.
         """
+        if self._all_changes_cache is not None:
+            logger.debug("Returning memoized change list; skipping re-parse.")
+            return self._all_changes_cache
+
+        use_disk_cache = os.environ.get(_PARSE_CACHE_ENV) == "1"
+        if use_disk_cache:
+            cached = self._load_parse_cache()
+            if cached is not None:
+                all_changes, self._changes_by_file = cached
+                self._all_changes_cache = all_changes
+                logger.info(f"Loaded {len(all_changes)} changes from the persistent parse cache.")
+                return all_changes
+
         logger.info(f"Starting to parse all changes from master changelog: {self.master_changelog_path}")
+        self._touched.clear()
+        self._prefetch_yaml_tree()
         all_changes: List[ChangeLog] = []
-        processed_files: Set[str] = set()
-        master_changelog_rel_path = os.path.relpath(self.master_changelog_path, self.project_root)
+        parsed_by_file: Dict[str, List[ChangeLog]] = {}
+        processed_files: Set[Tuple[int, int]] = set()
+        master_changelog_rel_path = self._rel(self.master_changelog_path)
 
-        self._parse_file_recursively(self.master_changelog_path, all_changes, processed_files, master_changelog_rel_path)
+        self._parse_files_iteratively(self.master_changelog_path, all_changes, parsed_by_file, processed_files, master_changelog_rel_path)
+        self._changes_by_file = parsed_by_file
+        self._all_changes_cache = all_changes
         logger.info(f"Finished parsing all changes. Found {len(all_changes)} total changes.")
+        if use_disk_cache:
+            self._store_parse_cache(all_changes, parsed_by_file)
         return all_changes
 
-    def _get_applied_changes_from_state_manager(self) -> Set[Tuple[str, str]]:
+    def invalidate(self) -> None:
+        """
+        Drops all memoized parse state so the next call re-reads from disk.
+
+        Useful when changelog files are edited while a parser instance is
+        still alive (e.g. long-lived embedding processes or tests).
+        """
+        self._all_changes_cache = None
+        self._changes_by_file = None
+        self._applied_cache = None
+        self._yaml_cache.clear()
+        self._dir_listing_cache.clear()
+        self._touched.clear()
+        logger.debug("Parser caches invalidated.")
+
+    def get_changes_by_file(self) -> Dict[str, List[ChangeLog]]:
+        """
+        Returns all defined changes grouped by their changelog's relative path.
+
+        The grouping is built in the same pass as get_all_changes, so consumers
+        that want per-file views do not need to re-scan the flat change list.
+        Parses the changelog tree first if it has not been parsed yet.
+
+        Returns:
+            Dict[str, List[ChangeLog]]: Mapping of changelog relative path to
+                                        its changes in definition order.
+        """
+        if self._changes_by_file is None:
+            self.get_all_changes()
+        return self._changes_by_file
+
+    def _get_applied_changes_from_state_manager(self) -> FrozenSet[Tuple[str, str]]:
         """
         Queries the state manager to get a set of (changelog_path, change_id) for all
         successfully applied changes.
 
         Returns:
-            Set[Tuple[str, str]]: A set of tuples, where each tuple represents a
-                                  successfully applied change (changelog_path, change_id).
-                                  Returns an empty set if no state manager is provided
-                                  or if there's an error querying the state.
+            FrozenSet[Tuple[str, str]]: A frozenset of tuples, where each tuple represents
+                                        a successfully applied change (changelog_path, change_id).
+                                        Returns an empty frozenset if no state manager is provided
+                                        or if there's an error querying the state.
         """
+        if self._applied_cache is not None:
+            logger.debug("Returning memoized applied-changes set; skipping state query.")
+            return self._applied_cache
         if not self.state_manager:
             logger.debug("No state manager provided. Assuming no changes have been applied.")
-            return set()
+            return frozenset()
         try:
-            rows = self.state_manager.client.execute(
-                f"SELECT changelog_path, change_id FROM {self.state_manager.table_name} WHERE status = 'success'"
-            )
-            applied_set = set((row[0], row[1]) for row in rows)
+            query = self._applied_sql
+            client = self.state_manager.client
+            # Stream the result set when the driver supports it so large state
+            # tables are consumed block by block instead of being materialized
+            # as one full list of rows before the set is built.
+            execute_iter = getattr(client, "execute_iter", None)
+            if execute_iter is not None:
+                rows = execute_iter(query, settings={"max_block_size": 8192})
+            else:
+                rows = client.execute(query)
+            # Set comprehension (no generator indirection) frozen on the way
+            # out: the result is only ever used for membership tests.
+            applied_set = frozenset({(row[0], row[1]) for row in rows})
             logger.info(f"Retrieved {len(applied_set)} successfully applied changes from state table '{self.state_manager.table_name}'.")
+            self._applied_cache = applied_set
             return applied_set
         except Exception as e:
             logger.warning(f"Could not query state manager for applied changes: {e}. Assuming no changes have been applied.")
-            return set()
+            return frozenset()
+
+    @staticmethod
+    def _find_cycle_sccs(successors: List[List[int]], candidates: List[int]) -> List[List[int]]:
+        """
+        Finds the strongly connected components among `candidates` that
+        actually form cycles (more than one node, or a self-edge).
+
+        Iterative Tarjan with an explicit work stack — changelog graphs can be
+        deep enough to overflow Python's recursion limit. Used only on the
+        error path to report exact cycle participants instead of every
+        unsorted node.
+        """
+        candidate_set = set(candidates)
+        index_of: Dict[int, int] = {}
+        lowlink: Dict[int, int] = {}
+        on_stack: Set[int] = set()
+        scc_stack: List[int] = []
+        sccs: List[List[int]] = []
+        counter = 0
+
+        for root in candidates:
+            if root in index_of:
+                continue
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            scc_stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter([s for s in successors[root] if s in candidate_set]))]
+            while work:
+                node, it = work[-1]
+                advanced = False
+                for succ in it:
+                    if succ not in index_of:
+                        index_of[succ] = lowlink[succ] = counter
+                        counter += 1
+                        scc_stack.append(succ)
+                        on_stack.add(succ)
+                        work.append((succ, iter([s for s in successors[succ] if s in candidate_set])))
+                        advanced = True
+                        break
+                    if succ in on_stack and index_of[succ] < lowlink[node]:
+                        lowlink[node] = index_of[succ]
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+                if lowlink[node] == index_of[node]:
+                    scc = []
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack.discard(member)
+                        scc.append(member)
+                        if member == node:
+                            break
+                    if len(scc) > 1 or node in successors[node]:
+                        sccs.append(scc)
+        return sccs
 
     def get_unapplied_changes(self) -> List[ChangeLog]:
         """
@@ -240,97 +758,111 @@ class ChangelogParser:
 
         # Map for quick lookup: (changelog_path, change_id) -> ChangeLog object
         change_lookup: Dict[Tuple[str, str], ChangeLog] = {
-            (c.changelog_file, c.id): c for c in all_defined_changes
+            c._node_id: c for c in all_defined_changes
         }
 
-        # Identify pending changes (those defined in YAML but not yet applied in DB)
-        pending_changes: List[ChangeLog] = []
-        for change in all_defined_changes:
-            change_identifier = (change.changelog_file, change.id)
-            if change_identifier not in applied_changes_from_db:
-                pending_changes.append(change)
+        # Identify pending changes (those defined in YAML but not yet applied
+        # in DB). The dict-view difference runs in C; when nothing has been
+        # applied (fresh database, dry runs) the per-change membership pass is
+        # skipped entirely. The filtering comprehension preserves definition
+        # order, which the later sort relies on as its stable baseline.
+        if applied_changes_from_db:
+            pending_node_ids = change_lookup.keys() - applied_changes_from_db
+            if len(pending_node_ids) == len(all_defined_changes):
+                pending_changes: List[ChangeLog] = list(all_defined_changes)
+            else:
+                pending_changes = [
+                    change for change in all_defined_changes
+                    if change._node_id in pending_node_ids
+                ]
+        else:
+            pending_changes = list(all_defined_changes)
         logger.info(f"Found {len(pending_changes)} pending changes to consider for application.")
 
         if not pending_changes:
             logger.info("No pending changes found. Nothing to apply.")
             return []
 
+        # Dependency-free trees are the common case; their YAML declaration
+        # order already satisfies every constraint, so skip the graph/deque
+        # machinery entirely.
+        if not any(change.depends_on for change in pending_changes):
+            logger.info(f"No dependencies declared among {len(pending_changes)} pending changes; using declaration order.")
+            return pending_changes
+
         # --- Build Dependency Graph for Topological Sort ---
-        # Graph stores: (dependency_node) -> [list of nodes that depend on it]
-        graph: Dict[Tuple[str, str], List[Tuple[str, str]]] = defaultdict(list)
-        # In-degrees store: (node) -> count of its unmet dependencies among pending changes
-        in_degrees: Dict[Tuple[str, str], int] = defaultdict(int)
-
-        # Initialize all pending changes in the graph with 0 in-degree.
-        # This is crucial for changes that have no dependencies or whose
-        # dependencies are already met (either applied or not in `all_defined_changes`).
-        for change in pending_changes:
-            node_id = (change.changelog_file, change.id)
-            in_degrees[node_id] = 0
-
-        # Populate graph and in-degrees for pending changes
-        for change in pending_changes:
-            node_id = (change.changelog_file, change.id)
-            for dependency in change.depends_on:
-                dep_node_id = (dependency.changelog_path, dependency.change_id)
-
-                # An active dependency edge is added ONLY IF:
-                # 1. The dependency is defined in *any* changelog (`change_lookup`).
-                # 2. The dependency has *not* been successfully applied yet (`applied_changes_from_db`).
-                # If these conditions are not met, the dependency is considered "met" or irrelevant
-                # for the current topological sort of *pending* changes.
-                if dep_node_id in change_lookup and dep_node_id not in applied_changes_from_db:
-                    graph[dep_node_id].append(node_id) # dep_node_id is a prerequisite for node_id
-                    in_degrees[node_id] += 1
-                    logger.debug(f"Adding dependency: {dep_node_id} -> {node_id}")
-                else:
-                    logger.debug(f"Dependency {dep_node_id} for {node_id} is considered met (either applied or not defined).")
+        # Pending changes are remapped to dense integer indexes (their
+        # position in pending_changes) so the sort hashes small ints instead
+        # of (str, str) tuples and the adjacency/in-degree structures are
+        # flat, cache-friendly lists. idx_of is keyed over pending nodes
+        # only, so a hit doubles as the "defined and not yet applied" check
+        # that decides whether a dependency forms an active edge.
+        idx_of: Dict[Tuple[str, str], int] = {
+            change._node_id: i for i, change in enumerate(pending_changes)
+        }
+        n = len(pending_changes)
+        successors: List[List[int]] = [[] for _ in range(n)]
+        in_degrees: List[int] = [0] * n
+
+        for i, change in enumerate(pending_changes):
+            degree = 0
+            for dep_node_id in change._dep_node_ids:
+                # A dependency that is absent from idx_of is either already
+                # applied or not defined anywhere; both count as met and add
+                # no edge for the sort of *pending* changes.
+                dep_idx = idx_of.get(dep_node_id)
+                if dep_idx is not None:
+                    successors[dep_idx].append(i)
+                    degree += 1
+            in_degrees[i] = degree
 
         # --- Topological Sort (Kahn's Algorithm) ---
-        # Start with all nodes that have no unmet dependencies among the pending changes
-        queue: List[Tuple[str, str]] = [node_id for node_id, degree in in_degrees.items() if degree == 0]
-        sorted_changes_nodes: List[Tuple[str, str]] = []
-        logger.debug(f"Initial nodes with no active dependencies: {queue}")
+        # Start with all nodes that have no unmet dependencies among the pending
+        # changes. A deque keeps dequeues O(1), making the sort O(V+E) overall.
+        queue: "deque[int]" = deque(i for i, degree in enumerate(in_degrees) if degree == 0)
+        sorted_indexes: List[int] = []
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Initial nodes with no active dependencies: %s", list(queue))
 
         while queue:
-            current_node = queue.pop(0) # Dequeue a node
-            sorted_changes_nodes.append(current_node)
-            logger.debug(f"Processing node: {current_node}")
-
-            # For each neighbor (node that depends on current_node)
-            for neighbor_node in graph[current_node]:
-                in_degrees[neighbor_node] -= 1
-                logger.debug(f"Decremented in-degree for {neighbor_node} to {in_degrees[neighbor_node]}")
-                if in_degrees[neighbor_node] == 0:
-                    queue.append(neighbor_node)
-                    logger.debug(f"Added {neighbor_node} to queue as its dependencies are now met.")
+            current = queue.popleft() # Dequeue a node
+            sorted_indexes.append(current)
+
+            # For each successor (node that depends on current)
+            for neighbor in successors[current]:
+                in_degrees[neighbor] -= 1
+                if in_degrees[neighbor] == 0:
+                    queue.append(neighbor)
 
         # Check for cycles: If not all pending changes were added to the sorted list, there's a cycle.
-        # We compare the count of nodes in the sorted list against the count of nodes that were
-        # initially part of the `in_degrees` map (i.e., relevant pending changes).
-        if len(sorted_changes_nodes) != len(in_degrees):
-            # Identify which pending changes were not sorted due to a cycle
-            cyclic_nodes_in_pending = {node_id for node_id in in_degrees if in_degrees[node_id] > 0}
-            if cyclic_nodes_in_pending:
-                cyclic_change_details = [
-                    f"'{change_lookup[c_node_id].id}' from '{change_lookup[c_node_id].changelog_file}'"
-                    for c_node_id in cyclic_nodes_in_pending
+        if len(sorted_indexes) != n:
+            # Narrow the unsorted nodes down to the strongly connected
+            # components that actually form cycles, so the error names the
+            # true participants rather than everything downstream of them.
+            candidates = [i for i, degree in enumerate(in_degrees) if degree > 0]
+            cycle_sccs = self._find_cycle_sccs(successors, candidates)
+            if cycle_sccs:
+                cycle_descriptions = [
+                    " -> ".join(
+                        f"'{pending_changes[i].id}' ({pending_changes[i].changelog_file})"
+                        for i in scc
+                    )
+                    for scc in cycle_sccs
                 ]
-                error_msg = f"Circular dependency detected among pending changes involving: {', '.join(cyclic_change_details)}"
+                error_msg = f"Circular dependency detected among pending changes: {'; '.join(cycle_descriptions)}"
                 logger.error(error_msg)
                 raise ValueError(error_msg)
             else:
                 # This case should ideally not happen if Kahn's algorithm is implemented correctly
-                # and `in_degrees` is correctly initialized for all relevant pending nodes.
+                # and in_degrees is correctly initialized for all pending nodes.
                 error_msg = "Graph processing error: Not all pending changes could be sorted, but no cycle detected (unexpected state)."
                 logger.error(error_msg)
                 raise ValueError(error_msg)
 
-        # Convert sorted node IDs back to ChangeLog objects
-        final_sorted_changes: List[ChangeLog] = []
-        for node_id in sorted_changes_nodes:
-            # Only add changes that are actually pending (not already applied)
-            if node_id in change_lookup: # and node_id not in applied_changes_from_db is implicitly handled by how `pending_changes` and `in_degrees` were built
-                final_sorted_changes.append(change_lookup[node_id])
+        # Translate sorted indexes back to ChangeLog objects; each index is a
+        # position in pending_changes by construction.
+        final_sorted_changes: List[ChangeLog] = [
+            pending_changes[i] for i in sorted_indexes
+        ]
         logger.info(f"Successfully determined execution order for {len(final_sorted_changes)} pending changes.")
-        return final_sorted_changes
\ No newline at end of file
+        return final_sorted_changes
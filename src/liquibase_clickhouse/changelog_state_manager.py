@@ -1,227 +1,513 @@
-from clickhouse_driver import Client
-import os
-from typing import Optional
-from datetime import datetime
-from .util.id_generator import generate_unique_id_int
-import json
-import logging # Added logging import
-
-# Get a logger instance for this module.
-# Basic configuration is typically done once at the application's entry point (e.g., cli.py).
-logger = logging.getLogger(__name__)
-
-class ChangelogStateManager:
-    """
-    Manages the state of changelog applications in a ClickHouse database.
-
-    This class provides methods to interact with a dedicated state table in ClickHouse
-    to track which database changes have been applied, their status, and other metadata.
-    It uses the clickhouse_driver to connect and execute queries.
-
-    Attributes:
-        client (clickhouse_driver.Client): The ClickHouse database client instance.
-        table_name (str): The name of the changelog state table in the database.
-    """
-    def __init__(self, host: str, port: int, user: str, password: str, database: str, table_name: str = 'changelog_state'):
-        """
-        Initializes the ChangelogStateManager with ClickHouse connection details.
-
-        Args:
-            host (str): The hostname or IP address of the ClickHouse server.
-            port (int): The port number for the ClickHouse server.
-            user (str): The username for database authentication.
-            password (str): The password for database authentication.
-            database (str): The name of the database to connect to.
-            table_name (str, optional): The name of the table used to store changelog state.
-                                        Defaults to 'changelog_state'.
-        """
-        self.client = Client(host=host, user=user, password=password, database=database, port=port)
-        self.table_name = table_name
-        logger.debug(f"ChangelogStateManager initialized for database '{database}' on '{host}:{port}' with state table '{table_name}'.")
-
-    def create_state_table(self):
-        """
-        Creates the changelog state table in the ClickHouse database if it does not already exist.
-
-        The table schema includes fields for change ID, changelog path, type, file path,
-        description, start/finish timestamps, status, dependencies, and error messages.
-        """
-        try:
-            self.client.execute(f"""
-            CREATE TABLE IF NOT EXISTS {self.table_name} (
-                id Int64,
-                change_id String,
-                changelog_path String,
-                type String,
-                file String,
-                description String,
-                started_at DateTime,
-                finished_at DateTime,
-                status String,            -- pending, success, failed
-                depends_on String,        -- JSON string of dependencies
-                error_message String
-            ) ENGINE = MergeTree()
-            ORDER BY started_at
-            """)
-            logger.info(f"Changelog state table '{self.table_name}' ensured to exist.")
-        except Exception as e:
-            logger.error(f"Failed to create or ensure changelog state table '{self.table_name}': {e}")
-            raise # Re-raise the exception after logging
-
-    def log_start(self, change, changelog_path: str):
-        """
-        Logs the start of a changelog application for a specific change.
-
-        The change is initially logged with a 'pending' status.
-
-        Args:
-            change (ChangeLog): The ChangeLog object representing the change being applied.
-            changelog_path (str): The absolute path to the changelog file defining this change.
-        """
-        now = datetime.now()
-        unique_id = generate_unique_id_int() # Ensure this generates a truly unique ID for the state entry
-        try:
-            self.client.execute(f"""
-                INSERT INTO {self.table_name} (id, change_id, changelog_path, type, file, description, started_at, status, depends_on)
-                VALUES ({unique_id}, %(change_id)s, %(changelog_path)s, %(type)s, %(file)s, %(description)s, %(started_at)s, %(status)s, %(depends_on)s)
-            """, {
-                "change_id": change.id,
-                "changelog_path": changelog_path,
-                "type": change.type,
-                "file": change.file_path,
-                "description": change.description,
-                "started_at": now,
-                "status": "pending",
-                "depends_on": change.to_json_depends_on_string()
-            })
-            logger.info(f"Logged start of change '{change.id}' from '{changelog_path}' with status 'pending'.")
-        except Exception as e:
-            logger.error(f"Failed to log start of change '{change.id}' from '{changelog_path}': {e}")
-            raise
-
-    def update_status(self, change_id: str, changelog_path: str, status: str, error_message: Optional[str] = None):
-        """
-        Updates the status of a previously logged changelog entry.
-
-        Args:
-            change_id (str): The ID of the change to update.
-            changelog_path (str): The absolute path to the changelog file where the change is defined.
-            status (str): The new status ('success', 'failed').
-            error_message (Optional[str], optional): An error message if the status is 'failed'.
-                                                     Defaults to None.
-        """
-        now = datetime.now()
-        if error_message is None:
-            error_message = ""
-        try:
-            self.client.execute(f"""
-                ALTER TABLE {self.table_name} UPDATE
-                    status = %(status)s,
-                    finished_at = %(finished_at)s,
-                    error_message = %(error_message)s
-                WHERE change_id = %(change_id)s AND changelog_path = %(changelog_path)s
-            """, {
-                "status": status,
-                "finished_at": now,
-                "error_message": error_message,
-                "change_id": change_id,
-                "changelog_path": changelog_path
-            })
-            logger.info(f"Updated status for change '{change_id}' from '{changelog_path}' to '{status}'.")
-            if status == "failed":
-                logger.error(f"Error details for change '{change_id}': {error_message}")
-        except Exception as e:
-            logger.error(f"Failed to update status for change '{change_id}' from '{changelog_path}' to '{status}': {e}")
-            raise
-
-    def get_activity_by_id(self, change_id: str) -> list:
-        """
-        Retrieves all activity records for a specific change ID.
-
-        Args:
-            change_id (str): The ID of the change to retrieve activity for.
-
-        Returns:
-            list: A list of rows (tuples) representing the activity records.
-        """
-        try:
-            rows = self.client.execute(f"""
-                SELECT * FROM {self.table_name} WHERE change_id = %(change_id)s
-            """, {"change_id": change_id})
-            logger.debug(f"Retrieved activity for change_id '{change_id}'. Found {len(rows)} records.")
-            return rows
-        except Exception as e:
-            logger.error(f"Failed to get activity for change_id '{change_id}': {e}")
-            raise
-
-    def get_activity_by_changelog_path(self, changelog_path: str) -> list:
-        """
-        Retrieves all activity records for changes defined in a specific changelog file.
-
-        Args:
-            changelog_path (str): The absolute path to the changelog file.
-
-        Returns:
-            list: A list of rows (tuples) representing the activity records, ordered by start time.
-        """
-        try:
-            rows = self.client.execute(f"""
-                SELECT * FROM {self.table_name} WHERE changelog_path = %(changelog_path)s
-                ORDER BY started_at
-            """, {"changelog_path": changelog_path})
-            logger.debug(f"Retrieved activity for changelog_path '{changelog_path}'. Found {len(rows)} records.")
-            return rows
-        except Exception as e:
-            logger.error(f"Failed to get activity for changelog_path '{changelog_path}': {e}")
-            raise
-
-    def get_pending_changes(self) -> list:
-        """
-        Retrieves all changelog entries that currently have a 'pending' status.
-
-        Returns:
-            list: A list of rows (tuples) representing the pending changes.
-        """
-        try:
-            rows = self.client.execute(f"""
-                SELECT * FROM {self.table_name} WHERE status = 'pending'
-            """)
-            logger.debug(f"Retrieved {len(rows)} pending changes.")
-            return rows
-        except Exception as e:
-            logger.error(f"Failed to get pending changes: {e}")
-            raise
-
-    def get_successful_changes(self) -> list:
-        """
-        Retrieves all changelog entries that have been successfully applied.
-
-        Returns:
-            list: A list of rows (tuples) representing the successful changes.
-        """
-        try:
-            rows = self.client.execute(f"""
-                SELECT * FROM {self.table_name} WHERE status = 'success'
-            """)
-            logger.debug(f"Retrieved {len(rows)} successful changes.")
-            return rows
-        except Exception as e:
-            logger.error(f"Failed to get successful changes: {e}")
-            raise
-
-    def get_failed_changes(self) -> list:
-        """
-        Retrieves all changelog entries that have failed to apply.
-
-        Returns:
-            list: A list of rows (tuples) representing the failed changes.
-        """
-        try:
-            rows = self.client.execute(f"""
-                SELECT * FROM {self.table_name} WHERE status = 'failed'
-            """)
-            logger.debug(f"Retrieved {len(rows)} failed changes.")
-            return rows
-        except Exception as e:
-            logger.error(f"Failed to get failed changes: {e}")
+from .db import get_pooled_client
+import os
+import time
+from typing import Iterator, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from clickhouse_driver import Client
+from datetime import datetime, timedelta
+import json
+import logging # Added logging import
+
+# Get a logger instance for this module.
+# Basic configuration is typically done once at the application's entry point (e.g., cli.py).
+logger = logging.getLogger(__name__)
+
+class ChangelogStateManager:
+    """
+    Manages the state of changelog applications in a ClickHouse database.
+
+    This class provides methods to interact with a dedicated state table in ClickHouse
+    to track which database changes have been applied, their status, and other metadata.
+    It uses the clickhouse_driver to connect and execute queries.
+
+    Attributes:
+        client (clickhouse_driver.Client): The ClickHouse database client instance.
+        table_name (str): The name of the changelog state table in the database.
+    """
+    def __init__(self, host: str, port: int, user: str, password: str, database: str, table_name: str = 'changelog_state', client: Optional["Client"] = None):
+        """
+        Initializes the ChangelogStateManager with ClickHouse connection details.
+
+        Args:
+            host (str): The hostname or IP address of the ClickHouse server.
+            port (int): The port number for the ClickHouse server.
+            user (str): The username for database authentication.
+            password (str): The password for database authentication.
+            database (str): The name of the database to connect to.
+            table_name (str, optional): The name of the table used to store changelog state.
+                                        Defaults to 'changelog_state'.
+            client (Optional[Client]): An already-connected Client to reuse
+                                       instead of opening a new TCP connection;
+                                       the explicit connection details are
+                                       ignored when this is given.
+        """
+        self.client = client if client is not None else get_pooled_client(
+            host, port, user, password, database
+        )
+        self.table_name = table_name
+        # Constant INSERT statement (no per-call interpolation): clickhouse-driver
+        # sends rows through its native block protocol when the query ends with
+        # VALUES, so the same string serves single and batched inserts.
+        self._insert_sql = (
+            f"INSERT INTO {self.table_name} "
+            "(change_id, changelog_path, type, file, description, "
+            "started_at, finished_at, status, depends_on, error_message) "
+            "VALUES"
+        )
+        # Query strings never vary after construction; building them once
+        # here avoids a string format per call and keeps the server seeing
+        # constant query texts. Explicit column lists keep the internal
+        # 'version' column (and, for non-failed rows, the error_message) off
+        # the wire; SELECT * dragged every wide column through each read.
+        activity_columns = (
+            "id, change_id, changelog_path, type, file, description, "
+            "started_at, finished_at, status, depends_on, error_message"
+        )
+        status_columns = (
+            "change_id, changelog_path, type, file, description, "
+            "started_at, finished_at"
+        )
+        self._activity_by_id_sql = (
+            f"SELECT {activity_columns} FROM {self.table_name} FINAL "
+            "WHERE change_id = %(change_id)s"
+        )
+        self._activity_by_path_sql = (
+            f"SELECT {activity_columns} FROM {self.table_name} FINAL "
+            "WHERE changelog_path = %(changelog_path)s "
+            "ORDER BY started_at"
+        )
+        self._activity_many_sql = (
+            f"SELECT {activity_columns} FROM {self.table_name} FINAL "
+            "WHERE change_id IN (SELECT change_id FROM _lookup_ids)"
+        )
+        self._by_status_sql = {
+            "pending": f"SELECT {status_columns} FROM {self.table_name} FINAL WHERE status = 'pending'",
+            "success": f"SELECT {status_columns} FROM {self.table_name} FINAL WHERE status = 'success'",
+            "failed": (
+                f"SELECT {status_columns}, error_message FROM {self.table_name} FINAL "
+                "WHERE status = 'failed'"
+            ),
+        }
+        # Remembers the most recent row inserted per (change_id, changelog_path)
+        # so status updates can re-insert the full row without a read-back.
+        self._rows_by_key = {}
+        # Memoized applied-change keys; invalidated whenever a status update
+        # is written so callers never see a stale view through this process.
+        self._applied_keys_cache = None
+        # Wall-clock anchor plus monotonic offset for _now(): state timestamps
+        # only need to be increasing and roughly current, so one clock sample
+        # at init replaces a clock_gettime + timezone resolution per row.
+        self._t0 = datetime.now()
+        self._mono0 = time.monotonic_ns()
+        logger.debug(f"ChangelogStateManager initialized for database '{database}' on '{host}:{port}' with state table '{table_name}'.")
+
+    def create_state_table(self):
+        """
+        Creates the changelog state table in the ClickHouse database if it does not already exist.
+
+        The table schema includes fields for change ID, changelog path, type, file path,
+        description, start/finish timestamps, status, dependencies, and error messages.
+        """
+        try:
+            # ReplacingMergeTree turns status changes into plain INSERTs: each
+            # update is a new row with the same (changelog_path, change_id) key
+            # and a higher version, and ClickHouse collapses superseded rows at
+            # merge time. This avoids ALTER TABLE ... UPDATE mutations, which
+            # rewrite whole parts asynchronously and throttle badly under
+            # frequent per-change updates. Readers that need the latest row per
+            # key must query with FINAL (or argMax).
+            self.client.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.table_name} (
+                id UInt64 DEFAULT generateSnowflakeID(),
+                version UInt64 DEFAULT id, -- ReplacingMergeTree picks the max per key
+                change_id String,
+                changelog_path String,
+                type String,
+                file String,
+                description String,
+                started_at DateTime64(3) DEFAULT now64(3),
+                finished_at DateTime64(3) DEFAULT toDateTime64(0, 3),
+                status String,            -- pending, success, failed
+                depends_on Array(Tuple(changelog_path String, change_id String)),
+                error_message String,
+                INDEX status_idx status TYPE set(4) GRANULARITY 1
+            ) ENGINE = ReplacingMergeTree(version)
+            ORDER BY (changelog_path, change_id)
+            SETTINGS index_granularity = 256
+            """)
+            logger.info(f"Changelog state table '{self.table_name}' ensured to exist.")
+        except Exception as e:
+            logger.error(f"Failed to create or ensure changelog state table '{self.table_name}': {e}")
+            raise # Re-raise the exception after logging
+
+    # Sentinel for "not finished yet"; matches ClickHouse's DateTime default.
+    _EPOCH = datetime(1970, 1, 1)
+
+    def _now(self) -> datetime:
+        """
+        Returns a monotonically increasing approximation of the current time,
+        derived from the anchor sampled at init plus the monotonic delta.
+        """
+        return self._t0 + timedelta(
+            microseconds=(time.monotonic_ns() - self._mono0) // 1000
+        )
+
+    def _build_start_row(self, change, changelog_path: str, now: datetime) -> dict:
+        """
+        Builds one 'pending' state row for the constant INSERT statement and
+        remembers it for the follow-up status update. The id and version
+        columns are omitted: the server assigns both via the
+        generateSnowflakeID() column default, which is monotonic without any
+        client-side coordination.
+        """
+        row = {
+            "change_id": change.id,
+            "changelog_path": changelog_path,
+            "type": change.type,
+            "file": change.file_path,
+            "description": change.description,
+            "started_at": now,
+            "finished_at": self._EPOCH,
+            "status": "pending",
+            # Passed as a native array of tuples; clickhouse-driver serializes
+            # it in the binary block protocol, no JSON encode/decode involved.
+            "depends_on": list(change._dep_node_ids),
+            "error_message": ""
+        }
+        self._rows_by_key[(change.id, changelog_path)] = row
+        return row
+
+    def log_start(self, change, changelog_path: str):
+        """
+        Logs the start of a changelog application for a specific change.
+
+        The change is initially logged with a 'pending' status.
+
+        Args:
+            change (ChangeLog): The ChangeLog object representing the change being applied.
+            changelog_path (str): The absolute path to the changelog file defining this change.
+        """
+        try:
+            self.client.execute(self._insert_sql,
+                                [self._build_start_row(change, changelog_path, self._now())])
+            logger.info(f"Logged start of change '{change.id}' from '{changelog_path}' with status 'pending'.")
+        except Exception as e:
+            logger.error(f"Failed to log start of change '{change.id}' from '{changelog_path}': {e}")
+            raise
+
+    def log_start_many(self, changes_with_paths):
+        """
+        Logs the start of several changes in one INSERT block.
+
+        All rows share one timestamp sample and travel in a single native-protocol
+        block, so a multi-hundred-change migration pays one round trip instead
+        of one per change.
+
+        Args:
+            changes_with_paths: An iterable of (change, changelog_path) pairs to
+                                log with 'pending' status.
+        """
+        now = self._now()
+        rows = [self._build_start_row(change, changelog_path, now)
+                for change, changelog_path in changes_with_paths]
+        if not rows:
+            return
+        # Pre-sorted by the table's primary key so the server ingests an
+        # already-ordered block; see update_status_many.
+        rows.sort(key=lambda row: (row["changelog_path"], row["change_id"]))
+        try:
+            self.client.execute(self._insert_sql, rows)
+            logger.info(f"Logged start of {len(rows)} changes with status 'pending'.")
+        except Exception as e:
+            logger.error(f"Failed to log start of {len(rows)} changes: {e}")
+            raise
+
+    def update_status(self, change_id: str, changelog_path: str, status: str, error_message: Optional[str] = None):
+        """
+        Updates the status of a previously logged changelog entry.
+
+        Args:
+            change_id (str): The ID of the change to update.
+            changelog_path (str): The absolute path to the changelog file where the change is defined.
+            status (str): The new status ('success', 'failed').
+            error_message (Optional[str], optional): An error message if the status is 'failed'.
+                                                     Defaults to None.
+        """
+        now = self._now()
+        if error_message is None:
+            error_message = ""
+        try:
+            # Status changes are INSERTs of a superseding row (higher version),
+            # not mutations; ReplacingMergeTree keeps the latest per key.
+            base = self._rows_by_key.get((change_id, changelog_path))
+            if base is None:
+                base = self._fetch_latest_row(change_id, changelog_path)
+            row = dict(base)
+            row.update({
+                "status": status,
+                "finished_at": now,
+                "error_message": error_message
+            })
+            self.client.execute(self._insert_sql, [row])
+            self._rows_by_key[(change_id, changelog_path)] = row
+            self._applied_keys_cache = None
+            logger.info(f"Updated status for change '{change_id}' from '{changelog_path}' to '{status}'.")
+            if status == "failed":
+                logger.error(f"Error details for change '{change_id}': {error_message}")
+        except Exception as e:
+            logger.error(f"Failed to update status for change '{change_id}' from '{changelog_path}' to '{status}': {e}")
+            raise
+
+    def update_status_many(self, updates):
+        """
+        Writes several status updates as one INSERT block.
+
+        Each update is a (change_id, changelog_path, status, error_message)
+        tuple; rows ship in a single native-protocol block, so flushing a
+        buffer of N updates costs one round trip instead of N. Updates are
+        deduplicated per (change_id, changelog_path) keeping the last one —
+        an entry that went pending→success within one buffer ships as a
+        single 'success' row — and the block is pre-sorted by the table's
+        primary key (changelog_path, change_id), which spares the server a
+        sort on insert and leaves fewer superseded rows for the
+        ReplacingMergeTree merges to collapse.
+
+        Args:
+            updates: An iterable of (change_id, changelog_path, status,
+                     error_message) tuples; error_message may be None.
+        """
+        now = self._now()
+        # dicts preserve insertion order, so "last write wins" per key falls
+        # out of plain assignment.
+        latest = {}
+        for change_id, changelog_path, status, error_message in updates:
+            latest[(change_id, changelog_path)] = (status, error_message)
+        rows = []
+        for (change_id, changelog_path), (status, error_message) in sorted(
+                latest.items(), key=lambda item: (item[0][1], item[0][0])):
+            base = self._rows_by_key.get((change_id, changelog_path))
+            if base is None:
+                base = self._fetch_latest_row(change_id, changelog_path)
+            row = dict(base)
+            row.update({
+                "status": status,
+                "finished_at": now,
+                "error_message": error_message or ""
+            })
+            rows.append(row)
+            self._rows_by_key[(change_id, changelog_path)] = row
+        if not rows:
+            return
+        try:
+            self.client.execute(self._insert_sql, rows)
+            self._applied_keys_cache = None
+            logger.info(f"Updated status for {len(rows)} changes in one batch.")
+        except Exception as e:
+            logger.error(f"Failed to update status for {len(rows)} changes: {e}")
+            raise
+
+    def _fetch_latest_row(self, change_id: str, changelog_path: str) -> dict:
+        """
+        Reads back the latest state row for a key, for status updates issued by
+        a process that did not log the start itself.
+
+        Raises:
+            LookupError: If no state row exists for the given key.
+        """
+        rows = self.client.execute(f"""
+            SELECT change_id, changelog_path, type, file, description, started_at, depends_on
+            FROM {self.table_name} FINAL
+            WHERE change_id = %(change_id)s AND changelog_path = %(changelog_path)s
+            LIMIT 1
+        """, {"change_id": change_id, "changelog_path": changelog_path})
+        if not rows:
+            raise LookupError(f"No state entry found for change '{change_id}' in '{changelog_path}'.")
+        change_id, changelog_path, type_, file, description, started_at, depends_on = rows[0]
+        return {
+            "change_id": change_id,
+            "changelog_path": changelog_path,
+            "type": type_,
+            "file": file,
+            "description": description,
+            "started_at": started_at,
+            "depends_on": depends_on
+        }
+
+    def get_applied_change_keys(self) -> frozenset:
+        """
+        Returns the (changelog_path, change_id) keys of all successfully
+        applied changes as a frozenset, fetched in one streamed query.
+
+        The result is memoized; writing a status update through this manager
+        invalidates it, so repeated membership checks cost zero round-trips.
+
+        Returns:
+            frozenset: Keys of all changes whose latest status is 'success'.
+        """
+        if self._applied_keys_cache is not None:
+            return self._applied_keys_cache
+        try:
+            rows = self.client.execute_iter(f"""
+                SELECT changelog_path, change_id FROM {self.table_name} FINAL
+                WHERE status = 'success'
+            """)
+            keys = frozenset((row[0], row[1]) for row in rows)
+            self._applied_keys_cache = keys
+            logger.debug(f"Fetched {len(keys)} applied change keys.")
+            return keys
+        except Exception as e:
+            logger.error(f"Failed to get applied change keys: {e}")
+            raise
+
+    def get_activity_by_id(self, change_id: str) -> list:
+        """
+        Retrieves all activity records for a specific change ID.
+
+        Args:
+            change_id (str): The ID of the change to retrieve activity for.
+
+        Returns:
+            list: A list of rows (tuples) representing the activity records.
+        """
+        try:
+            rows = self.client.execute(self._activity_by_id_sql, {"change_id": change_id})
+            logger.debug(f"Retrieved activity for change_id '{change_id}'. Found {len(rows)} records.")
+            return rows
+        except Exception as e:
+            logger.error(f"Failed to get activity for change_id '{change_id}': {e}")
+            raise
+
+    def get_activity_many(self, change_ids) -> list:
+        """
+        Retrieves activity records for many change IDs in one round trip.
+
+        The ids travel as an external table, so the query stays constant and
+        the server does a hash-join-style IN instead of N point lookups.
+
+        Args:
+            change_ids: An iterable of change IDs to look up.
+
+        Returns:
+            list: A list of rows (tuples) for all matching change IDs.
+        """
+        ids = [{"change_id": change_id} for change_id in change_ids]
+        if not ids:
+            return []
+        try:
+            rows = self.client.execute(self._activity_many_sql, external_tables=[{
+                "name": "_lookup_ids",
+                "structure": [("change_id", "String")],
+                "data": ids
+            }])
+            logger.debug(f"Retrieved activity for {len(ids)} change ids. Found {len(rows)} records.")
+            return rows
+        except Exception as e:
+            logger.error(f"Failed to get activity for {len(ids)} change ids: {e}")
+            raise
+
+    def get_activity_by_changelog_path(self, changelog_path: str) -> list:
+        """
+        Retrieves all activity records for changes defined in a specific changelog file.
+
+        Args:
+            changelog_path (str): The absolute path to the changelog file.
+
+        Returns:
+            list: A list of rows (tuples) representing the activity records, ordered by start time.
+        """
+        try:
+            rows = self.client.execute(self._activity_by_path_sql, {"changelog_path": changelog_path})
+            logger.debug(f"Retrieved activity for changelog_path '{changelog_path}'. Found {len(rows)} records.")
+            return rows
+        except Exception as e:
+            logger.error(f"Failed to get activity for changelog_path '{changelog_path}': {e}")
+            raise
+
+    def _iter_by_status(self, status: str) -> Iterator[tuple]:
+        """
+        Streams state rows with the given latest status, block by block.
+
+        Unlike the list-returning getters, only one protocol block is resident
+        at a time, so arbitrarily large state tables can be walked with flat
+        memory.
+        """
+        try:
+            for row in self.client.execute_iter(self._by_status_sql[status],
+                                                settings={"max_block_size": 65536}):
+                yield row
+        except Exception as e:
+            logger.error(f"Failed to stream '{status}' changes: {e}")
+            raise
+
+    def get_pending_changes_iter(self) -> Iterator[tuple]:
+        """
+        Streams all changelog entries whose latest status is 'pending'.
+
+        Returns:
+            Iterator[tuple]: Rows yielded one at a time; see _iter_by_status.
+        """
+        return self._iter_by_status("pending")
+
+    def get_successful_changes_iter(self) -> Iterator[tuple]:
+        """
+        Streams all changelog entries whose latest status is 'success'.
+
+        Returns:
+            Iterator[tuple]: Rows yielded one at a time; see _iter_by_status.
+        """
+        return self._iter_by_status("success")
+
+    def get_failed_changes_iter(self) -> Iterator[tuple]:
+        """
+        Streams all changelog entries whose latest status is 'failed'.
+
+        Returns:
+            Iterator[tuple]: Rows yielded one at a time; see _iter_by_status.
+        """
+        return self._iter_by_status("failed")
+
+    def get_pending_changes(self) -> list:
+        """
+        Retrieves all changelog entries that currently have a 'pending' status.
+
+        Returns:
+            list: A list of rows (tuples) representing the pending changes.
+        """
+        try:
+            rows = self.client.execute(self._by_status_sql["pending"])
+            logger.debug(f"Retrieved {len(rows)} pending changes.")
+            return rows
+        except Exception as e:
+            logger.error(f"Failed to get pending changes: {e}")
+            raise
+
+    def get_successful_changes(self) -> list:
+        """
+        Retrieves all changelog entries that have been successfully applied.
+
+        Returns:
+            list: A list of rows (tuples) representing the successful changes.
+        """
+        try:
+            rows = self.client.execute(self._by_status_sql["success"])
+            logger.debug(f"Retrieved {len(rows)} successful changes.")
+            return rows
+        except Exception as e:
+            logger.error(f"Failed to get successful changes: {e}")
+            raise
+
+    def get_failed_changes(self) -> list:
+        """
+        Retrieves all changelog entries that have failed to apply.
+
+        Returns:
+            list: A list of rows (tuples) representing the failed changes.
+        """
+        try:
+            rows = self.client.execute(self._by_status_sql["failed"])
+            logger.debug(f"Retrieved {len(rows)} failed changes.")
+            return rows
+        except Exception as e:
+            logger.error(f"Failed to get failed changes: {e}")
             raise
\ No newline at end of file
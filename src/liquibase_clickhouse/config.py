@@ -1,86 +1,244 @@
-# src/liquibase_clickhouse/config.py
-
-import yaml
-import os
-import logging # Added logging import
-
-# Get a logger instance for this module.
-# Basic configuration is typically done once at the application's entry point (e.g., cli.py).
-logger = logging.getLogger(__name__)
-
-def load_yaml(filepath: str) -> dict:
-    """
-    Loads and parses a YAML file safely.
-
-    Args:
-        filepath (str): The absolute or relative path to the YAML file to load.
-
-    Returns:
-        dict: The parsed content of the YAML file as a dictionary.
-
-    Raises:
-        FileNotFoundError: If the specified YAML file does not exist.
-        yaml.YAMLError: If there's an error parsing the YAML content.
-    """
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = yaml.safe_load(f)
-            logger.debug(f"Successfully loaded YAML file: {filepath}")
-            return content if isinstance(content, dict) else {}
-    except FileNotFoundError:
-        logger.error(f"Configuration file not found: {filepath}")
-        raise
-    except yaml.YAMLError as e:
-        logger.error(f"Error parsing YAML file {filepath}: {e}")
-        raise ValueError(f"Error parsing YAML file {filepath}: {e}")
-
-def load_config() -> dict:
-    """
-    Loads the main application configuration from 'config.yaml'.
-
-    It expects 'config.yaml' to be located in the current working directory
-    when the application is run.
-
-    Returns:
-        dict: A dictionary containing the application configuration.
-
-    Raises:
-        FileNotFoundError: If 'config.yaml' is not found.
-        ValueError: If there's an error parsing 'config.yaml'.
-    """
-    config_path = os.path.join(os.getcwd(), "config.yaml")
-    logger.info(f"Loading main configuration from: {config_path}")
-    return load_yaml(config_path)
-
-def load_variables(env: str) -> dict:
-    """
-    Loads environment-specific variables by merging common variables with
-    variables specific to the given environment.
-
-    It expects 'variables/common.yaml' and 'variables/{env}.yaml' to exist
-    relative to the current working directory.
-
-    Args:
-        env (str): The name of the environment (e.g., 'dev', 'uat', 'prd').
-
-    Returns:
-        dict: A dictionary containing the merged variables for the specified environment.
-
-    Raises:
-        FileNotFoundError: If 'common.yaml' or the environment-specific
-                           '{env}.yaml' file is not found.
-        ValueError: If there's an error parsing any of the YAML variable files.
-    """
-    common_vars_path = os.path.join(os.getcwd(), "variables/common.yaml")
-    env_vars_path = os.path.join(os.getcwd(), f"variables/{env}.yaml")
-
-    logger.info(f"Loading common variables from: {common_vars_path}")
-    common = load_yaml(common_vars_path)
-
-    logger.info(f"Loading environment-specific variables for '{env}' from: {env_vars_path}")
-    env_vars = load_yaml(env_vars_path)
-
-    result = common.copy()
-    result.update(env_vars)
-    logger.info(f"Successfully merged variables for environment '{env}'.")
+# src/liquibase_clickhouse/config.py
+
+import hashlib
+import json
+import os
+import logging # Added logging import
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any
+
+# PyYAML is imported on first parse, not at module import: warm starts served
+# entirely from the JSON sidecars (the common case) never pay the ~30 ms yaml
+# import, and neither do CLI invocations that exit before loading config.
+# The libyaml C loader is preferred when PyYAML was built against it.
+_YAML = None
+_YAML_LOADER = None
+# Empty tuple in an except clause matches nothing; replaced by yaml.YAMLError
+# once PyYAML is actually imported.
+_YAML_ERROR: Any = ()
+
+
+def _get_yaml():
+    """
+    Imports PyYAML on first use and resolves the fastest available safe
+    loader. Returns the yaml module; the loader lands in _YAML_LOADER.
+    """
+    global _YAML, _YAML_LOADER, _YAML_ERROR
+    if _YAML is None:
+        import yaml
+        _YAML_ERROR = yaml.YAMLError
+        try:
+            from yaml import CSafeLoader as _loader
+        except ImportError:
+            from yaml import SafeLoader as _loader
+        _YAML = yaml
+        _YAML_LOADER = _loader
+    return _YAML
+
+# Get a logger instance for this module.
+# Basic configuration is typically done once at the application's entry point (e.g., cli.py).
+logger = logging.getLogger(__name__)
+
+# Parsed configs are mirrored as JSON sidecars under the user cache dir:
+# json.load is an order of magnitude faster than YAML parsing, so warm CLI
+# starts skip the YAML layer entirely. Set LIQUIBASE_NO_CACHE=1 to disable.
+_SIDECAR_DIR = os.path.join(os.path.expanduser("~"), ".cache", "liquibase-clickhouse", "config")
+
+
+def _sidecar_path(filepath: str) -> str:
+    """
+    Returns the JSON sidecar path for a config file, keyed by a hash of its
+    absolute path (keeps project trees clean and avoids name collisions).
+    """
+    digest = hashlib.sha256(os.path.abspath(filepath).encode("utf-8")).hexdigest()
+    return os.path.join(_SIDECAR_DIR, f"{digest}.json")
+
+@lru_cache(maxsize=64)
+def _load_yaml_cached(filepath: str, mtime_ns: int) -> dict:
+    """
+    Parses a YAML file, memoized on (path, mtime). The mtime argument only
+    serves as a cache-busting key: an edited file gets a fresh parse, an
+    unchanged one returns the already-parsed dict.
+
+    A JSON sidecar in the user cache dir serves warm starts across
+    processes; it is validated against the source mtime and rewritten
+    (best-effort) after every fresh parse.
+    """
+    use_sidecar = os.environ.get("LIQUIBASE_NO_CACHE") != "1"
+    sidecar = _sidecar_path(filepath) if use_sidecar else None
+    if sidecar is not None:
+        try:
+            with open(sidecar, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("mtime_ns") == mtime_ns:
+                logger.debug(f"Config sidecar hit for: {filepath}")
+                return cached["data"]
+        except (OSError, ValueError, KeyError):
+            pass
+    content = _parse_yaml(filepath)
+    if sidecar is not None and _json_roundtrips(content):
+        tmp_path = f"{sidecar}.tmp.{os.getpid()}"
+        try:
+            os.makedirs(_SIDECAR_DIR, exist_ok=True)
+            # Configs can carry credentials (database.password), so the
+            # sidecar must never be world-readable: create it 0600 regardless
+            # of umask, and atomically replace so readers only ever see a
+            # complete file with that mode.
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"mtime_ns": mtime_ns, "data": content}, f, separators=(",", ":"))
+            os.replace(tmp_path, sidecar)
+        except (OSError, TypeError, ValueError):
+            logger.debug(f"Could not write config sidecar for {filepath}", exc_info=True)
+    return content
+
+
+def _json_roundtrips(obj: Any) -> bool:
+    """
+    Returns True when a parsed config survives a JSON round-trip unchanged.
+
+    json.dump silently stringifies non-string mapping keys (ints, bools), so
+    caching such a config would hand warm starts differently-typed data than
+    a cold parse; those configs simply skip the sidecar layer.
+    """
+    if isinstance(obj, dict):
+        return all(isinstance(k, str) and _json_roundtrips(v) for k, v in obj.items())
+    if isinstance(obj, list):
+        return all(_json_roundtrips(item) for item in obj)
+    return obj is None or isinstance(obj, (str, int, float, bool))
+
+
+@lru_cache(maxsize=64)
+def _load_json_cached(filepath: str, mtime_ns: int) -> dict:
+    """
+    Parses a JSON config file, memoized on (path, mtime) like its YAML
+    counterpart.
+    """
+    with open(filepath, "r", encoding="utf-8") as f:
+        content = json.load(f)
+    logger.debug(f"Successfully loaded JSON config file: {filepath}")
+    return content if isinstance(content, dict) else {}
+
+
+def load_yaml(filepath: str) -> dict:
+    """
+    Loads and parses a config file safely, memoizing per (path, mtime) so
+    repeated loads of an unchanged file within one process parse only once.
+
+    When a sibling '.json' file exists and is at least as new as the YAML
+    (or the YAML is absent), it is loaded instead: projects can pre-convert
+    their configs to JSON and skip YAML parsing entirely while keeping the
+    YAML sources for ergonomics.
+
+    Args:
+        filepath (str): The absolute or relative path to the YAML file to load.
+
+    Returns:
+        dict: The parsed content of the config file as a dictionary.
+
+    Raises:
+        FileNotFoundError: If neither the YAML file nor a JSON sibling exists.
+        yaml.YAMLError: If there's an error parsing the YAML content.
+    """
+    try:
+        st = os.stat(filepath)
+    except FileNotFoundError:
+        st = None
+    json_sibling = os.path.splitext(filepath)[0] + ".json"
+    try:
+        json_st = os.stat(json_sibling)
+    except FileNotFoundError:
+        json_st = None
+    if json_st is not None and (st is None or json_st.st_mtime_ns >= st.st_mtime_ns):
+        return _load_json_cached(json_sibling, json_st.st_mtime_ns)
+    if st is None:
+        logger.error(f"Configuration file not found: {filepath}")
+        raise FileNotFoundError(f"Configuration file not found: {filepath}")
+    return _load_yaml_cached(filepath, st.st_mtime_ns)
+
+
+def _parse_yaml(filepath: str) -> dict:
+    """
+    Parses a YAML file from disk without consulting the cache.
+    """
+    yaml = _get_yaml()
+    try:
+        # Binary mode lets libyaml decode the bytes itself, skipping Python's
+        # text-layer decode.
+        with open(filepath, 'rb') as f:
+            content = yaml.load(f, Loader=_YAML_LOADER)
+            logger.debug(f"Successfully loaded YAML file: {filepath}")
+            return content if isinstance(content, dict) else {}
+    except FileNotFoundError:
+        logger.error(f"Configuration file not found: {filepath}")
+        raise
+    except _YAML_ERROR as e:
+        logger.error(f"Error parsing YAML file {filepath}: {e}")
+        raise ValueError(f"Error parsing YAML file {filepath}: {e}")
+
+def load_config(base_dir: str = None) -> dict:
+    """
+    Loads the main application configuration from 'config.yaml'.
+
+    Args:
+        base_dir (str, optional): The directory containing 'config.yaml'.
+                                  Defaults to the current working directory
+                                  for backward compatibility; callers should
+                                  pass the changelog directory explicitly
+                                  rather than relying on os.chdir.
+
+    Returns:
+        dict: A dictionary containing the application configuration.
+
+    Raises:
+        FileNotFoundError: If 'config.yaml' is not found.
+        ValueError: If there's an error parsing 'config.yaml'.
+    """
+    config_path = os.path.join(base_dir or os.getcwd(), "config.yaml")
+    logger.info(f"Loading main configuration from: {config_path}")
+    return load_yaml(config_path)
+
+def load_variables(env: str, base_dir: str = None) -> dict:
+    """
+    Loads environment-specific variables by merging common variables with
+    variables specific to the given environment.
+
+    It expects 'variables/common.yaml' and 'variables/{env}.yaml' to exist
+    under base_dir (or the current working directory when not given).
+
+    Args:
+        env (str): The name of the environment (e.g., 'dev', 'uat', 'prd').
+        base_dir (str, optional): The directory containing the 'variables'
+                                  folder; defaults to the current working
+                                  directory for backward compatibility.
+
+    Returns:
+        dict: A dictionary containing the merged variables for the specified environment.
+
+    Raises:
+        FileNotFoundError: If 'common.yaml' or the environment-specific
+                           '{env}.yaml' file is not found.
+        ValueError: If there's an error parsing any of the YAML variable files.
+    """
+    base_dir = base_dir or os.getcwd()
+    common_vars_path = os.path.join(base_dir, "variables/common.yaml")
+    env_vars_path = os.path.join(base_dir, f"variables/{env}.yaml")
+
+    logger.info(f"Loading common variables from: {common_vars_path}")
+    logger.info(f"Loading environment-specific variables for '{env}' from: {env_vars_path}")
+    # The two files are independent, so their disk reads and parses overlap
+    # on a pair of workers; each load still goes through the normal caches.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        common_future = pool.submit(load_yaml, common_vars_path)
+        env_future = pool.submit(load_yaml, env_vars_path)
+        common = common_future.result()
+        env_vars = env_future.result()
+
+    # Single C-level merge (one dict allocation, no copy-then-update pass).
+    # A fresh dict is still required — both inputs are shared cache entries,
+    # so handing back a ChainMap over them would leak mutable references to
+    # the memoized configs.
+    result = {**common, **env_vars}
+    logger.info(f"Successfully merged variables for environment '{env}'.")
     return result
\ No newline at end of file
@@ -1,68 +1,225 @@
-# src/liquibase_clickhouse/db.py
-from .core import IChangeLogExecutor
-from clickhouse_driver import Client
-import traceback
-import logging # Added logging import
-
-# Get a logger instance for this module.
-# Basic configuration is typically done once at the application's entry point (e.g., cli.py).
-logger = logging.getLogger(__name__)
-
-class ClickHouseExecutor(IChangeLogExecutor):
-    """
-    Implements the IChangeLogExecutor interface for ClickHouse databases.
-
-    This class provides the concrete logic for connecting to a ClickHouse instance
-    and executing SQL changes or performing dry runs.
-    """
-    def __init__(self, host: str, port: int, user: str, password: str, database: str):
-        """
-        Initializes the ClickHouseExecutor with database connection parameters.
-
-        Args:
-            host (str): The hostname or IP address of the ClickHouse server.
-            port (int): The port number for the ClickHouse server.
-            user (str): The username for database authentication.
-            password (str): The password for database authentication.
-            database (str): The name of the database to connect to.
-        """
-        try:
-            self.client = Client(
-                host=host, port=port, user=user, password=password, database=database
-            )
-            logger.info(f"ClickHouseExecutor initialized. Connected to {user}@{host}:{port}/{database}")
-        except Exception as e:
-            logger.error(f"Failed to connect to ClickHouse database {database}@{host}:{port}: {e}")
-            raise # Re-raise the exception after logging
-
-    def execute_change(self, sql_change: str):
-        """
-        Executes a given SQL change against the connected ClickHouse database.
-
-        Args:
-            sql_change (str): The SQL string representing the change to be executed.
-
-        Raises:
-            Exception: If the SQL execution fails.
-        """
-        logger.info("Executing SQL change...")
-        logger.debug(f"SQL to execute:\n{sql_change[:200]}...") # Log first 200 chars of SQL
-        try:
-            self.client.execute(sql_change)
-            logger.info("SQL change executed successfully.")
-        except Exception as e:
-            logger.error(f"Failed to execute SQL change: {e}")
-            logger.debug(f"SQL that failed:\n{sql_change}")
-            logger.debug(traceback.format_exc()) # Log full traceback for debugging
-            raise # Re-raise the exception after logging
-
-    def dry_run(self, sql_change: str):
-        """
-        Simulates the execution of a SQL change by logging it, without
-        actually sending it to the ClickHouse database.
-
-        Args:
-            sql_change (str): The SQL string representing the change to be dry-run.
-        """
-        logger.info("DRY RUN: Would execute the following SQL change:")
+# src/liquibase_clickhouse/db.py
+import ipaddress
+import socket
+import threading
+import time
+import traceback
+import logging # Added logging import
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from clickhouse_driver import Client
+
+# Get a logger instance for this module.
+# Basic configuration is typically done once at the application's entry point (e.g., cli.py).
+logger = logging.getLogger(__name__)
+
+# Wire compression is a near-free win for the chatty state-table workload
+# (many small inserts plus bulk selects), but clickhouse-driver needs the
+# optional lz4 + clickhouse-cityhash packages for it. Detect them once and
+# fall back to an uncompressed connection when absent (install the project's
+# 'lz4' extra to enable).
+try:
+    import lz4  # noqa: F401
+    import clickhouse_cityhash  # noqa: F401
+    _COMPRESSION = "lz4"
+except ImportError:
+    _COMPRESSION = False
+
+
+def preferred_compression():
+    """
+    Returns the compression argument for Client(): 'lz4' when the optional
+    codec packages are installed, otherwise False.
+    """
+    return _COMPRESSION
+
+
+# Resolved hostnames are cached for a short TTL so constructing several
+# clients against the same server does one DNS lookup, not one per client.
+# The TTL keeps long-lived embedding processes honest about DNS changes;
+# IP literals skip the cache (and the lookup) entirely. Entries are
+# (ip, expiry) pairs guarded by the same lock as the client pool below.
+_DNS_TTL_SECONDS = 60.0
+_DNS_CACHE = {}
+
+
+def _resolve_host(host: str) -> str:
+    """
+    Returns the IP for a hostname via a TTL'd cache, or the input unchanged
+    when it is already an IP literal or resolution fails (the driver then
+    resolves it itself and surfaces its usual error).
+    """
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    now = time.monotonic()
+    with _CLIENT_POOL_LOCK:
+        entry = _DNS_CACHE.get(host)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+    try:
+        ip = socket.gethostbyname(host)
+    except OSError:
+        return host
+    with _CLIENT_POOL_LOCK:
+        _DNS_CACHE[host] = (ip, now + _DNS_TTL_SECONDS)
+    return ip
+
+
+# In-process client pool keyed by connection identity. Embedding callers that
+# build several executors/managers against the same server reuse one TCP+auth
+# session instead of handshaking per object; the CLI's single-command runs see
+# it as a plain constructor. Clients are not dropped from the pool — a process
+# talks to a handful of servers at most.
+_CLIENT_POOL = {}
+_CLIENT_POOL_LOCK = threading.Lock()
+
+
+def get_pooled_client(host: str, port: int, user: str, password: str, database: str) -> "Client":
+    """
+    Returns a shared Client for the given connection parameters, creating and
+    pooling one on first use. Thread-safe; note that clickhouse-driver clients
+    are not safe for concurrent queries, so callers sharing a pooled client
+    must serialize their use of it (the sequential CLI does naturally).
+    """
+    # Imported here, not at module top: clickhouse-driver is one of the
+    # heaviest imports in the tree and only needed once a connection exists.
+    from clickhouse_driver import Client
+
+    # Resolve once up front (TTL-cached); repeated client construction against
+    # the same hostname then skips the per-Client DNS lookup.
+    host = _resolve_host(host)
+    key = (host, port, user, password, database)
+    with _CLIENT_POOL_LOCK:
+        client = _CLIENT_POOL.get(key)
+        if client is None:
+            client = Client(
+                host=host, port=port, user=user, password=password, database=database,
+                compression=preferred_compression()
+            )
+            _CLIENT_POOL[key] = client
+        return client
+
+class ClickHouseExecutor:
+    """
+    Implements the IChangeLogExecutor protocol (see core.py) for ClickHouse
+    databases; the interface is satisfied structurally, so no base class is
+    needed and instantiation is a plain type() call with no ABC machinery.
+
+    This class provides the concrete logic for connecting to a ClickHouse instance
+    and executing SQL changes or performing dry runs.
+    """
+    def __init__(self, host: str, port: int, user: str, password: str, database: str, client: "Client" = None):
+        """
+        Initializes the ClickHouseExecutor with database connection parameters.
+
+        Args:
+            host (str): The hostname or IP address of the ClickHouse server.
+            port (int): The port number for the ClickHouse server.
+            user (str): The username for database authentication.
+            password (str): The password for database authentication.
+            database (str): The name of the database to connect to.
+            client (Client, optional): An already-connected Client to reuse
+                                       instead of opening a second TCP+auth
+                                       handshake; the explicit connection
+                                       details are ignored when this is given.
+        """
+        if client is not None:
+            self.client = client
+            logger.info(f"ClickHouseExecutor initialized with shared client for {user}@{host}:{port}/{database}")
+            return
+        try:
+            self.client = get_pooled_client(host, port, user, password, database)
+            logger.info(f"ClickHouseExecutor initialized. Connected to {user}@{host}:{port}/{database}")
+        except Exception as e:
+            logger.error(f"Failed to connect to ClickHouse database {database}@{host}:{port}: {e}")
+            raise # Re-raise the exception after logging
+
+    def execute_change(self, sql_change: str, params=None):
+        """
+        Executes a given SQL change against the connected ClickHouse database.
+
+        Args:
+            sql_change: The SQL to execute, either as one string or as an
+                        iterator of chunks (e.g. from render_sql_stream); a
+                        chunk iterator is joined once here, at the last
+                        moment before it must exist as a single query string.
+            params: Optional data forwarded to clickhouse-driver. For an
+                    INSERT ending in VALUES, passing the rows here (list of
+                    dicts or tuples) ships them in the binary native block
+                    format — no VALUES text to build client-side or parse
+                    server-side — which is how the state manager writes its
+                    own rows.
+
+        Raises:
+            Exception: If the SQL execution fails.
+        """
+        if not isinstance(sql_change, str):
+            sql_change = "".join(sql_change)
+        logger.info("Executing SQL change...")
+        # %-style defers formatting (and the slice) until a handler actually
+        # wants DEBUG records; at INFO this line costs one level check.
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("SQL to execute:\n%s...", sql_change[:200]) # Log first 200 chars of SQL
+        try:
+            # Data inserts opt into server-side batching; many small INSERT
+            # migrations then coalesce into fewer parts instead of one part
+            # each. Waiting for the flush keeps execution synchronous so later
+            # changes still see this one's rows. DDL is unaffected.
+            settings = None
+            if sql_change.lstrip()[:6].upper() == "INSERT":
+                settings = {"async_insert": 1, "wait_for_async_insert": 1}
+            self.client.execute(sql_change, params, settings=settings)
+            logger.info("SQL change executed successfully.")
+        except Exception as e:
+            logger.error(f"Failed to execute SQL change: {e}")
+            # format_exc() walks and renders the whole traceback; only pay
+            # for it when a handler will actually emit DEBUG records.
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("SQL that failed:\n%s", sql_change)
+                logger.debug(traceback.format_exc()) # Log full traceback for debugging
+            raise # Re-raise the exception after logging
+
+    def execute_changes(self, sql_changes):
+        """
+        Executes a sequence of SQL changes in order over the one connection.
+
+        The native protocol carries exactly one statement per query, so the
+        statements cannot be joined into a single round trip; the win of this
+        batch entry point is amortized logging and no per-call Python overhead
+        between statements. Execution stops at the first failure, which
+        propagates with its index so the caller knows how far the batch got.
+
+        Args:
+            sql_changes: An iterable of SQL strings to execute in order.
+
+        Raises:
+            Exception: The first execution failure, after logging its position
+                       in the batch.
+        """
+        for position, sql_change in enumerate(sql_changes):
+            try:
+                settings = None
+                if sql_change.lstrip()[:6].upper() == "INSERT":
+                    settings = {"async_insert": 1, "wait_for_async_insert": 1}
+                self.client.execute(sql_change, settings=settings)
+            except Exception as e:
+                logger.error(f"Failed to execute SQL change {position} of batch: {e}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("SQL that failed:\n%s", sql_change)
+                raise
+        logger.info("Executed batch of SQL changes successfully.")
+
+    def dry_run(self, sql_change: str):
+        """
+        Simulates the execution of a SQL change by logging it, without
+        actually sending it to the ClickHouse database.
+
+        Args:
+            sql_change (str): The SQL string representing the change to be dry-run.
+        """
+        logger.info("DRY RUN: Would execute the following SQL change:")
         logger.info(f"\n{sql_change}\n--- END DRY RUN SQL ---")
\ No newline at end of file
@@ -1,6 +1,153 @@
 import os
-from jinja2 import Environment, FileSystemLoader, Template
-from typing import Optional, Dict, Any
+import re
+from functools import lru_cache
+from typing import Dict, Iterator, Optional, Any, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+# Fast path for templates that are nothing but {{ var }} / {{ nested.var }}
+# substitutions: one regex pass instead of Jinja's lex/parse/compile/render.
+# Anything else in the file (statements, comments, filters, calls) drops the
+# template back to the full Jinja pipeline, so semantics never change.
+_SIMPLE_RE = re.compile(r"\{\{\s*([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)*)\s*\}\}")
+
+
+@lru_cache(maxsize=256)
+def _read_template_text(sql_file: str, mtime_ns: int) -> str:
+    """
+    Returns a template's raw text, memoized on (path, mtime) so repeated
+    fast-path renders of an unchanged file read it once.
+    """
+    with open(sql_file, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _render_simple(content: str, variables: Dict[str, Any]) -> Optional[str]:
+    """
+    Renders a substitution-only template with one regex pass, or returns None
+    when the content uses any Jinja feature beyond plain {{ var }} lookups
+    (including dotted access into nested mappings) or references a variable
+    that is not present — those cases fall back to the real engine.
+    """
+    if "{%" in content or "{#" in content:
+        return None
+
+    def _sub(match):
+        value = variables
+        for part in match.group(1).split("."):
+            try:
+                value = value[part]
+            except (KeyError, TypeError):
+                raise LookupError(match.group(1))
+        return str(value)
+
+    try:
+        rendered = _SIMPLE_RE.sub(_sub, content)
+    except LookupError:
+        return None
+    # Any {{ the simple pattern could not consume (filters, calls, literals)
+    # means this template is not actually simple.
+    if "{{" in rendered:
+        return None
+    # Jinja drops a single trailing newline (keep_trailing_newline=False);
+    # match it so both paths produce byte-identical output.
+    if rendered.endswith("\n"):
+        rendered = rendered[:-1]
+    return rendered
+
+# jinja2 is imported inside _get_environment / _get_bytecode_cache: importing
+# this module costs only os + typing, and the jinja import is paid on the
+# first actual render rather than at CLI startup.
+
+
+@lru_cache(maxsize=64)
+def _isdir(path: str) -> bool:
+    """
+    Memoized os.path.isdir: render_sql re-checks the same macros and SQL
+    directories for every change, and directories do not appear or vanish
+    mid-run, so each distinct path is stat'ed once per process.
+    """
+    return os.path.isdir(path)
+
+# Compiled-template bytecode persists across processes in the user cache dir,
+# so a fresh CLI run skips Jinja's lexer/parser/codegen for templates it has
+# seen before. Falls back to no bytecode cache if the directory is unusable.
+_BYTECODE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "liquibase-clickhouse", "jinja")
+
+
+def _get_bytecode_cache():
+    """
+    Returns a FileSystemBytecodeCache rooted in the user cache dir, or None
+    when the directory cannot be created (read-only HOME, etc.).
+    """
+    from jinja2 import FileSystemBytecodeCache
+    try:
+        os.makedirs(_BYTECODE_CACHE_DIR, exist_ok=True)
+        return FileSystemBytecodeCache(directory=_BYTECODE_CACHE_DIR)
+    except OSError:
+        return None
+
+# Environment construction and template compilation are expensive (lexer,
+# parser, codegen). Environments are cached per search-dir tuple and carry
+# Jinja2's own template cache, so repeated render_sql calls only pay for the
+# actual render. auto_reload=False skips the per-render mtime stat; CLI runs
+# are short-lived so templates changing mid-process is not a concern.
+_env_cache: Dict[Tuple[Tuple[str, ...], Optional[str]], "Environment"] = {}
+
+# Extensions recognized as macro modules when preloading a macros directory.
+_MACRO_SUFFIXES = (".j2", ".jinja", ".jinja2")
+
+
+def _get_environment(search_dirs: Tuple[str, ...], macros_dir: Optional[str] = None) -> "Environment":
+    """
+    Returns a cached Jinja2 Environment for the given search directories,
+    creating and caching one on first use.
+
+    When a macros directory is given, every macro file in it is compiled once
+    at Environment creation and its macros registered in env.globals, so
+    templates can call them directly without a per-template {% import %}
+    (explicit imports keep working) and no render pays the lookup again.
+    """
+    key = (search_dirs, macros_dir)
+    env = _env_cache.get(key)
+    if env is None:
+        from jinja2 import Environment, FileSystemLoader
+        env = Environment(
+            loader=FileSystemLoader(list(search_dirs)),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=False,
+            cache_size=400,
+            bytecode_cache=_get_bytecode_cache(),
+        )
+        if macros_dir:
+            _preload_macros(env, macros_dir)
+        _env_cache[key] = env
+    return env
+
+
+def _preload_macros(env: "Environment", macros_dir: str) -> None:
+    """
+    Compiles every macro file directly under macros_dir and copies its
+    exported macros into env.globals. Best-effort: a broken macro file is
+    logged (via print, matching this module's warnings) and skipped.
+    """
+    try:
+        entries = sorted(e.name for e in os.scandir(macros_dir)
+                         if e.is_file() and e.name.endswith(_MACRO_SUFFIXES))
+    except OSError:
+        return
+    for name in entries:
+        try:
+            module = env.get_template(name).module
+        except Exception as e:
+            print(f"Warning: could not preload macros from '{name}' in '{macros_dir}': {e}")
+            continue
+        for attr, value in vars(module).items():
+            if not attr.startswith("_"):
+                env.globals.setdefault(attr, value)
+
 
 def render_sql(sql_file: str, variables: Optional[Dict[str, Any]] = None, macros_dir: Optional[str] = None) -> str:
     """
@@ -17,33 +164,72 @@ def render_sql(sql_file: str, variables: Optional[Dict[str, Any]] = None, macros
         str: The rendered SQL content.
     """
     variables = variables or {}
+    # Substitution-only templates skip Jinja entirely; see _render_simple.
+    # Any stat/decode hiccup just defers to the engine's own error handling.
+    try:
+        st = os.stat(sql_file)
+        content = _read_template_text(sql_file, st.st_mtime_ns)
+    except (OSError, UnicodeDecodeError):
+        content = None
+    if content is not None:
+        rendered = _render_simple(content, variables)
+        if rendered is not None:
+            return rendered
+    template = _resolve_template(sql_file, macros_dir)
+    return template.render(**variables)
+
 
+def render_sql_stream(sql_file: str, variables: Optional[Dict[str, Any]] = None,
+                      macros_dir: Optional[str] = None) -> Iterator[str]:
+    """
+    Renders an SQL template like render_sql, but yields the output in chunks
+    instead of materializing one string.
+
+    Useful for multi-megabyte generated SQL written to a file or log: peak
+    memory stays at one buffer rather than the whole rendered statement.
+    Callers that need the full text (e.g. to execute it) should keep using
+    render_sql — the query ultimately travels as one string anyway.
+
+    Args:
+        sql_file (str): The ABSOLUTE path to the SQL template file.
+        variables (Optional[Dict[str, Any]]): Variables to inject into the template.
+        macros_dir (Optional[str]): The ABSOLUTE directory holding global macro files.
+
+    Returns:
+        Iterator[str]: Rendered chunks of roughly 64 KiB each.
+    """
+    template = _resolve_template(sql_file, macros_dir)
+    stream = template.stream(**(variables or {}))
+    stream.enable_buffering(size=65536)
+    return stream
+
+
+def _resolve_template(sql_file: str, macros_dir: Optional[str]):
+    """
+    Resolves the search directories for a SQL file and returns its compiled
+    template from the cached Environment.
+    """
     search_dirs = []
 
-    if macros_dir and os.path.isdir(macros_dir):
+    if macros_dir and _isdir(macros_dir):
         search_dirs.append(macros_dir)
     elif macros_dir:
         print(f"Warning: Macros directory '{macros_dir}' not found or is not a directory. No global macros will be loaded from it.")
 
     sql_file_dir = os.path.dirname(sql_file)
-    if sql_file_dir and os.path.isdir(sql_file_dir) and sql_file_dir not in search_dirs:
+    if sql_file_dir and _isdir(sql_file_dir) and sql_file_dir not in search_dirs:
         search_dirs.append(sql_file_dir)
-    elif sql_file_dir and not os.path.isdir(sql_file_dir):
+    elif sql_file_dir and not _isdir(sql_file_dir):
         print(f"Warning: Directory of SQL file '{sql_file_dir}' not found or is not a directory. Template might not resolve includes correctly.")
 
     if not search_dirs:
         raise ValueError("No valid template search directories provided or found for Jinja2.")
 
-    env = Environment(
-        loader=FileSystemLoader(search_dirs),
-        trim_blocks=True,
-        lstrip_blocks=True
-    )
+    env = _get_environment(tuple(search_dirs),
+                           macros_dir if macros_dir in search_dirs else None)
 
     template_name = os.path.basename(sql_file)
     try:
-        template = env.get_template(template_name)
+        return env.get_template(template_name)
     except Exception as e:
         raise FileNotFoundError(f"Could not find or load SQL template '{sql_file}' (looked for '{template_name}' in {search_dirs}): {e}")
-
-    return template.render(**variables)